@@ -1,12 +1,22 @@
 """CLI for QFX/OFX converter."""
 
 import argparse
+import os
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import queue
 
 from . import __version__
-from .converter import QFXConverter
+
+
+def _job_count(value: str) -> int:
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"invalid job count: {value}")
+    return jobs
 
 
 def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
@@ -51,6 +61,20 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         help='Compact JSON output (no indentation). Only applies to JSON format.'
     )
     
+    parser.add_argument(
+        '-j', '--jobs',
+        type=_job_count,
+        default=1,
+        metavar='N',
+        help='Number of files to convert in parallel (0 = one per CPU). Default: 1'
+    )
+    
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Read the next file in the background while converting the current one'
+    )
+    
     parser.add_argument(
         '-v', '--version',
         action='version',
@@ -68,6 +92,166 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     return parser.parse_args(args)
 
 
+def _convert_one(
+    input_path: Path,
+    output_format: str,
+    output_file: Optional[str],
+    compact: bool,
+    content: Optional[bytes] = None
+) -> Path:
+    # Imported here so --help and --version don't load the OFX parser.
+    from .converter import QFXConverter
+    
+    converter = QFXConverter(input_path, content)
+    
+    if output_format == 'json':
+        indent = 0 if compact else 2
+        return converter.to_json(output_file, indent=indent)
+    return converter.to_csv(output_file)
+
+
+# The output path on success, the exception that stopped the conversion, or
+# None for a missing input that has already been reported.
+ConversionResult = Tuple[str, Union[Path, Exception, None]]
+
+
+def _check_input(input_file: str, input_path: Path) -> Optional[bool]:
+    """Report an input that can't be converted.
+    
+    Returns None when the input can be converted, otherwise whether skipping
+    it counts as an error.
+    """
+    if not input_path.exists():
+        print(f"Error: File not found: {input_file}", file=sys.stderr)
+        return True
+    
+    if input_path.is_dir():
+        print(f"Warning: Skipping directory: {input_file}", file=sys.stderr)
+        return False
+    
+    return None
+
+
+def _convert_sequential(
+    input_files: List[str],
+    args: argparse.Namespace
+) -> Iterator[ConversionResult]:
+    for input_file in input_files:
+        input_path = Path(input_file)
+        failed = _check_input(input_file, input_path)
+        if failed is not None:
+            if failed:
+                yield input_file, None
+            continue
+        
+        if not args.quiet:
+            print(f"Processing {input_file}...")
+        
+        try:
+            output_path = _convert_one(input_path, args.format, args.output, args.compact)
+        except Exception as e:
+            yield input_file, e
+        else:
+            yield input_file, output_path
+
+
+def _read_ahead(input_files: List[str], pending: 'queue.Queue') -> None:
+    try:
+        for input_file in input_files:
+            input_path = Path(input_file)
+            try:
+                content = input_path.read_bytes()
+            except Exception as e:
+                pending.put((input_file, input_path, None, e))
+            else:
+                pending.put((input_file, input_path, content, None))
+    finally:
+        # The converting side waits for this marker, so it must always arrive.
+        pending.put(None)
+
+
+def _convert_pipelined(
+    input_files: List[str],
+    args: argparse.Namespace
+) -> Iterator[ConversionResult]:
+    import queue
+    import threading
+    
+    # A reader thread loads the next file while this one is being converted.
+    pending: queue.Queue = queue.Queue(maxsize=2)
+    reader = threading.Thread(target=_read_ahead, args=(input_files, pending), daemon=True)
+    reader.start()
+    
+    for input_file, input_path, content, read_error in iter(pending.get, None):
+        # Inputs are checked here rather than in the reader so that problems
+        # are reported in order with the conversions.
+        failed = _check_input(input_file, input_path)
+        if failed is not None:
+            if failed:
+                yield input_file, None
+            continue
+        
+        if not args.quiet:
+            print(f"Processing {input_file}...")
+        
+        if read_error is not None:
+            # Reported the same way QFXConverter.parse() reports unreadable input.
+            error = ValueError(f"Failed to parse OFX file: {read_error}")
+            error.__cause__ = read_error
+            yield input_file, error
+            continue
+        
+        try:
+            output_path = _convert_one(
+                input_path, args.format, args.output, args.compact, content
+            )
+        except Exception as e:
+            yield input_file, e
+        else:
+            yield input_file, output_path
+    
+    reader.join()
+
+
+def _convert_parallel(
+    input_files: List[str],
+    args: argparse.Namespace,
+    jobs: int
+) -> Iterator[ConversionResult]:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    # Every input is checked before the workers start.
+    convertible = []
+    for input_file in input_files:
+        input_path = Path(input_file)
+        failed = _check_input(input_file, input_path)
+        if failed is None:
+            convertible.append((input_file, input_path))
+        elif failed:
+            yield input_file, None
+    
+    if not convertible:
+        return
+    
+    # Workers only convert; all output is printed from this process.
+    with ProcessPoolExecutor(max_workers=min(jobs, len(convertible))) as executor:
+        futures = {}
+        for input_file, input_path in convertible:
+            if not args.quiet:
+                print(f"Processing {input_file}...")
+            future = executor.submit(_convert_one, input_path, args.format, None, args.compact)
+            futures[future] = input_file
+        
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                output_path = future.result()
+            except Exception as e:
+                yield input_file, e
+            else:
+                yield input_file, output_path
+
+
 def main() -> int:
     args = parse_args()
     
@@ -79,50 +263,37 @@ def main() -> int:
     success_count = 0
     error_count = 0
     
-    for input_file in args.input_files:
-        input_path = Path(input_file)
-        
-        if not input_path.exists():
-            print(f"Error: File not found: {input_file}", file=sys.stderr)
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(args.input_files) > 1:
+        results = _convert_parallel(args.input_files, args, jobs)
+    elif args.pipeline:
+        results = _convert_pipelined(args.input_files, args)
+    else:
+        results = _convert_sequential(args.input_files, args)
+    
+    for input_file, output_path in results:
+        if output_path is None:
             error_count += 1
             continue
         
-        if input_path.is_dir():
-            print(f"Warning: Skipping directory: {input_file}", file=sys.stderr)
+        if isinstance(output_path, Exception):
+            error = output_path
+            if isinstance(error, (FileNotFoundError, ValueError)):
+                print(f"Error processing {input_file}: {error}", file=sys.stderr)
+            else:
+                print(f"Unexpected error processing {input_file}: {error}", file=sys.stderr)
+            error_count += 1
             continue
         
-        try:
-            if not args.quiet:
-                print(f"Processing {input_file}...")
-            
-            converter = QFXConverter(input_path)
-            output_file = args.output if args.output else None
-            
-            if args.format == 'json':
-                indent = 0 if args.compact else 2
-                output_path = converter.to_json(output_file, indent=indent)
-            else:
-                output_path = converter.to_csv(output_file)
-            
-            if not args.quiet:
-                print(f"  ✓ Created: {output_path}")
-                
-                if args.format == 'csv':
-                    positions_file = output_path.with_suffix('.positions.csv')
-                    if positions_file.exists():
-                        print(f"  ✓ Created: {positions_file}")
+        if not args.quiet:
+            print(f"  ✓ Created: {output_path}")
             
-            success_count += 1
-            
-        except FileNotFoundError as e:
-            print(f"Error processing {input_file}: {e}", file=sys.stderr)
-            error_count += 1
-        except ValueError as e:
-            print(f"Error processing {input_file}: {e}", file=sys.stderr)
-            error_count += 1
-        except Exception as e:
-            print(f"Unexpected error processing {input_file}: {e}", file=sys.stderr)
-            error_count += 1
+            if args.format == 'csv':
+                positions_file = output_path.with_suffix('.positions.csv')
+                if positions_file.exists():
+                    print(f"  ✓ Created: {positions_file}")
+        
+        success_count += 1
     
     if not args.quiet and len(args.input_files) > 1:
         print(f"\nProcessed {success_count} file(s) successfully, {error_count} error(s)")
@@ -1,151 +1,273 @@
 """QFX/OFX to CSV/JSON converter."""
 
-import csv
-import json
+import keyword
+import mmap
+import re
+import sys
 from datetime import datetime
 from decimal import Decimal
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO, Union
+from types import FunctionType, ModuleType
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, TextIO, Tuple, Union
 
-from ofxtools.Parser import OFXTree
+# Output files are written in large chunks rather than row-sized writes.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+_NON_ASCII = re.compile(rb'[^\x00-\x7f]')
+
+# Class attributes that are methods rather than OFX data.
+_METHOD_TYPES = (FunctionType, classmethod, staticmethod)
+
+# Attribute values copied into rows unchanged.
+_PLAIN_TYPES = (str, int, float, bool, Decimal)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _store_value(row: Dict[str, Any], name: str, value: Any) -> None:
+    # Decimals are kept exact: csv writes them in fixed-point and the JSON
+    # encoders convert them to numbers through _json_default.
+    if isinstance(value, datetime):
+        row[name] = value.isoformat()
+    elif isinstance(value, _PLAIN_TYPES):
+        row[name] = value
+    elif hasattr(value, '__dict__'):
+        if hasattr(value, 'uniqueid'):
+            row[f'{name}_uniqueid'] = value.uniqueid
+        if hasattr(value, 'uniqueidtype'):
+            row[f'{name}_uniqueidtype'] = value.uniqueidtype
+
+
+def _compile_extractor(attrs: Tuple[str, ...]) -> Callable[[Any, Dict[str, str]], Dict[str, Any]]:
+    """Generate a row builder that reads each attribute of one class directly."""
+    lines = ['def extract(obj, base):', '    row = base.copy()']
+    for name in attrs:
+        if name.isidentifier() and not keyword.iskeyword(name):
+            lines.append(f'    value = obj.{name}')
+        else:
+            lines.append(f'    value = getattr(obj, {name!r})')
+        lines.extend([
+            '    if value is not None:',
+            '        if value.__class__ in _PLAIN_TYPES:',
+            f'            row[{name!r}] = value',
+            '        else:',
+            f'            _store_value(row, {name!r}, value)',
+        ])
+    lines.append('    return row')
+
+    namespace: Dict[str, Any] = {
+        '_PLAIN_TYPES': frozenset(_PLAIN_TYPES),
+        '_store_value': _store_value,
+    }
+    exec(compile('\n'.join(lines), '<qfxconvert extractor>', 'exec'), namespace)
+    return namespace['extract']
+
+
+def _decode_text(content: Any) -> str:
+    try:
+        return str(content, 'utf-8')
+    except UnicodeDecodeError:
+        try:
+            return str(content, 'latin-1')
+        except UnicodeDecodeError:
+            return str(content, 'cp1252', errors='replace')
+
+
+def _normalize_to_ascii(content: Any) -> bytes:
+    import unicodedata
+    return unicodedata.normalize('NFKD', _decode_text(content)).encode('ascii', 'ignore')
+
+
+def _write_json_rows(
+    jsonfile: BinaryIO,
+    rows: List[Dict[str, Any]],
+    dumps: Callable[..., bytes]
+) -> None:
+    jsonfile.write(b'[')
+    separator = b''
+    for row in rows:
+        jsonfile.write(separator)
+        jsonfile.write(dumps(row, default=_json_default))
+        separator = b','
+    jsonfile.write(b']')
+
+
+def _csv_value(value: Any) -> Any:
+    # Fixed-point formatting keeps amounts exact without str()'s exponents (0E-8).
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    return value
+
+
+def _write_csv(output_file: Path, fieldnames: List[str], rows: List[Dict[str, Any]]) -> None:
+    import csv
+    
+    with open(output_file, 'w', newline='', encoding='utf-8',
+              buffering=_WRITE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        # Rows are emitted as plain value sequences in header order; missing
+        # fields come back from dict.get as None, which csv writes as ''.
+        writer.writerows(map(_csv_value, map(row.get, fieldnames)) for row in rows)
 
 
 class QFXConverter:
     """Converts QFX/OFX files to CSV or JSON."""
 
-    def __init__(self, input_file: Union[str, Path]):
+    def __init__(self, input_file: Union[str, Path], content: Optional[bytes] = None):
         self.input_file = Path(input_file)
-        if not self.input_file.exists():
+        if content is None and not self.input_file.exists():
             raise FileNotFoundError(f"Input file not found: {input_file}")
         
+        # Raw file contents, when the caller has already read them.
+        self._content = content
         self.ofx_data = None
         self._parsed = False
+        self._extracted: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+        self._trx_schema: List[str] = []
+        self._pos_schema: List[str] = []
+        self._attr_cache: Dict[type, Tuple[str, ...]] = {}
+        self._extractors: Dict[type, Callable[[Any, Dict[str, str]], Dict[str, Any]]] = {}
 
     def parse(self) -> None:
+        from ofxtools.Parser import OFXTree
+        
         try:
             parser = OFXTree()
-            with open(self.input_file, 'rb') as f:
-                content = f.read()
-            
-            try:
-                text = content.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    text = content.decode('latin-1')
-                except UnicodeDecodeError:
-                    text = content.decode('cp1252', errors='replace')
-            
-            import unicodedata
-            text = unicodedata.normalize('NFKD', text)
-            text = text.encode('ascii', 'ignore').decode('ascii')
-            
-            from io import BytesIO
-            parser.parse(BytesIO(text.encode('ascii')))
+            content = self._content
+            if content is None:
+                with open(self.input_file, 'rb') as f:
+                    try:
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (ValueError, OSError):
+                        # Pipes and other non-regular files can't be mapped.
+                        content = f.read()
+                    else:
+                        with mapped:
+                            # Scan and decode straight from the mapping; ASCII files
+                            # are handed to the parser as they are, without a copy.
+                            if _NON_ASCII.search(mapped) is None:
+                                parser.parse(f)
+                            else:
+                                parser.parse(BytesIO(_normalize_to_ascii(mapped)))
+
+            # Most statements are plain ASCII already and skip normalization entirely.
+            if content is not None:
+                if not content.isascii():
+                    content = _normalize_to_ascii(content)
+                parser.parse(BytesIO(content))
             
             self.ofx_data = parser.convert()
             self._parsed = True
+            self._extracted = None
         except Exception as e:
             raise ValueError(f"Failed to parse OFX file: {e}") from e
 
-    def _extract_transactions(self) -> List[Dict[str, Any]]:
+    def _extract_all(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if self._extracted is not None:
+            return self._extracted
+
         if not self._parsed:
             self.parse()
 
         transactions = []
+        positions = []
+        trx_fields: Set[str] = set()
+        pos_fields: Set[str] = set()
         statements = self.ofx_data.statements
         
+        # Walk the statements once, collecting transactions and positions together.
         for statement in statements:
             account = statement.account
-            account_info = {
-                'account_id': getattr(account, 'acctid', ''),
-                'account_type': getattr(account, 'accttype', ''),
-                'bank_id': getattr(account, 'bankid', getattr(account, 'brokerid', '')),
-            }
+            account_id = getattr(account, 'acctid', '')
+            bank_id = getattr(account, 'bankid', None)
+            # Only investment accounts carry a broker ID, so bank accounts skip that lookup.
+            broker_id = getattr(account, 'brokerid', '') if bank_id is None else ''
             
             stmt_transactions = statement.transactions
             if stmt_transactions:
+                account_info = {
+                    'account_id': account_id,
+                    'account_type': getattr(account, 'accttype', ''),
+                    'bank_id': broker_id if bank_id is None else bank_id,
+                }
                 for trx in stmt_transactions:
-                    trx_dict = self._transaction_to_dict(trx, account_info)
+                    trx_dict = self._obj_to_dict(trx, account_info)
+                    trx_fields.update(trx_dict)
                     transactions.append(trx_dict)
+            
+            stmt_positions = getattr(statement, 'positions', None)
+            if stmt_positions is not None:
+                account_info = {
+                    'account_id': account_id,
+                    'broker_id': broker_id,
+                }
+                for pos in stmt_positions:
+                    pos_dict = self._obj_to_dict(pos, account_info)
+                    pos_fields.update(pos_dict)
+                    positions.append(pos_dict)
 
-        return transactions
+        # Rows only carry attributes that are set, so the CSV columns are the
+        # union of the keys seen while building them.
+        self._trx_schema = sorted(trx_fields)
+        self._pos_schema = sorted(pos_fields)
+        self._extracted = (transactions, positions)
+        return self._extracted
 
-    def _transaction_to_dict(self, trx: Any, account_info: Dict[str, str]) -> Dict[str, Any]:
-        trx_dict = {}
-        trx_dict.update(account_info)
-        
-        for attr_name in dir(trx):
-            if attr_name.startswith('_') or callable(getattr(trx, attr_name)):
-                continue
-                
-            attr_value = getattr(trx, attr_name)
-            
-            if attr_value is None:
-                continue
-            
-            if isinstance(attr_value, datetime):
-                trx_dict[attr_name] = attr_value.isoformat()
-            elif isinstance(attr_value, Decimal):
-                trx_dict[attr_name] = float(attr_value)
-            elif isinstance(attr_value, (str, int, float, bool)):
-                trx_dict[attr_name] = attr_value
-            elif hasattr(attr_value, '__dict__'):
-                if hasattr(attr_value, 'uniqueid'):
-                    trx_dict[f'{attr_name}_uniqueid'] = attr_value.uniqueid
-                if hasattr(attr_value, 'uniqueidtype'):
-                    trx_dict[f'{attr_name}_uniqueidtype'] = attr_value.uniqueidtype
-        
-        return trx_dict
+    def _extract_transactions(self) -> List[Dict[str, Any]]:
+        return self._extract_all()[0]
 
     def _extract_positions(self) -> List[Dict[str, Any]]:
-        if not self._parsed:
-            self.parse()
+        return self._extract_all()[1]
 
-        positions = []
-        statements = self.ofx_data.statements
-        
-        for statement in statements:
-            if not hasattr(statement, 'positions') or statement.positions is None:
-                continue
-                
-            account = statement.account
-            account_info = {
-                'account_id': getattr(account, 'acctid', ''),
-                'broker_id': getattr(account, 'brokerid', ''),
-            }
+    def _data_attributes(self, obj: Any) -> Tuple[str, ...]:
+        cls = type(obj)
+        attrs = self._attr_cache.get(cls)
+        if attrs is None:
+            import inspect
+            from ofxtools.models.base import classproperty
             
-            for pos in statement.positions:
-                pos_dict = self._position_to_dict(pos, account_info)
-                positions.append(pos_dict)
-        
-        return positions
+            # Methods and ofxtools class-level metadata (spec, elements, ...)
+            # are rejected on the class, without binding or evaluating them.
+            skipped = _METHOD_TYPES + (classproperty,)
+            names = []
+            for name in dir(obj):
+                if name.startswith('_'):
+                    continue
+                if isinstance(inspect.getattr_static(cls, name, None), skipped):
+                    continue
+                if callable(getattr(obj, name, None)):
+                    continue
+                # Interned so every row dict shares the same key objects.
+                names.append(sys.intern(name))
+            attrs = tuple(names)
+            self._attr_cache[cls] = attrs
+        return attrs
 
-    def _position_to_dict(self, pos: Any, account_info: Dict[str, str]) -> Dict[str, Any]:
-        pos_dict = {}
-        pos_dict.update(account_info)
-        
-        for attr_name in dir(pos):
-            if attr_name.startswith('_') or callable(getattr(pos, attr_name)):
-                continue
-                
-            attr_value = getattr(pos, attr_name)
-            
-            if attr_value is None:
-                continue
-            
-            if isinstance(attr_value, datetime):
-                pos_dict[attr_name] = attr_value.isoformat()
-            elif isinstance(attr_value, Decimal):
-                pos_dict[attr_name] = float(attr_value)
-            elif isinstance(attr_value, (str, int, float, bool)):
-                pos_dict[attr_name] = attr_value
-            elif hasattr(attr_value, '__dict__'):
-                if hasattr(attr_value, 'uniqueid'):
-                    pos_dict[f'{attr_name}_uniqueid'] = attr_value.uniqueid
-                if hasattr(attr_value, 'uniqueidtype'):
-                    pos_dict[f'{attr_name}_uniqueidtype'] = attr_value.uniqueidtype
-        
-        return pos_dict
+    def _obj_to_dict(self, obj: Any, base: Dict[str, str]) -> Dict[str, Any]:
+        cls = type(obj)
+        extractor = self._extractors.get(cls)
+        if extractor is None:
+            extractor = _compile_extractor(self._data_attributes(obj))
+            self._extractors[cls] = extractor
+
+        try:
+            return extractor(obj, base)
+        except AttributeError:
+            # An attribute seen on the first instance is missing on this one.
+            obj_dict = base.copy()
+            for attr_name in self._data_attributes(obj):
+                attr_value = getattr(obj, attr_name, None)
+                if attr_value is not None:
+                    _store_value(obj_dict, attr_name, attr_value)
+            return obj_dict
 
     def to_csv(self, output_file: Optional[Union[str, Path]] = None) -> Path:
         if output_file is None:
@@ -153,33 +275,15 @@ class QFXConverter:
         else:
             output_file = Path(output_file)
 
-        transactions = self._extract_transactions()
+        transactions, positions = self._extract_all()
         
         if not transactions:
             raise ValueError("No transactions found in OFX file")
 
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = set()
-            for trx in transactions:
-                fieldnames.update(trx.keys())
-            fieldnames = sorted(fieldnames)
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(transactions)
+        _write_csv(output_file, self._trx_schema, transactions)
 
-        positions = self._extract_positions()
         if positions:
-            positions_file = output_file.with_suffix('.positions.csv')
-            with open(positions_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = set()
-                for pos in positions:
-                    fieldnames.update(pos.keys())
-                fieldnames = sorted(fieldnames)
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-                writer.writeheader()
-                writer.writerows(positions)
+            _write_csv(output_file.with_suffix('.positions.csv'), self._pos_schema, positions)
 
         return output_file
 
@@ -189,19 +293,46 @@ class QFXConverter:
         else:
             output_file = Path(output_file)
 
-        transactions = self._extract_transactions()
+        transactions, positions = self._extract_all()
         
         if not transactions:
             raise ValueError("No transactions found in OFX file")
 
         data = {'transactions': transactions}
         
-        positions = self._extract_positions()
         if positions:
             data['positions'] = positions
 
-        with open(output_file, 'w', encoding='utf-8') as jsonfile:
-            json.dump(data, jsonfile, indent=indent if indent > 0 else None)
+        import importlib
+        
+        orjson: Optional[ModuleType]
+        try:
+            orjson = importlib.import_module('orjson')
+        except ImportError:
+            orjson = None
+
+        # orjson only supports compact or 2-space output; other indents use json.
+        if orjson is not None and indent == 0:
+            # Compact output is streamed row by row rather than built in memory.
+            with open(output_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as jsonfile:
+                jsonfile.write(b'{')
+                separator = b''
+                for key, rows in data.items():
+                    jsonfile.write(separator + orjson.dumps(key) + b':')
+                    _write_json_rows(jsonfile, rows, orjson.dumps)
+                    separator = b','
+                jsonfile.write(b'}')
+        elif orjson is not None and indent == 2:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=_json_default)
+            with open(output_file, 'wb') as jsonfile:
+                jsonfile.write(payload)
+        else:
+            import json
+            
+            with open(output_file, 'w', encoding='utf-8',
+                      buffering=_WRITE_BUFFER_SIZE) as jsonfile:
+                json.dump(data, jsonfile, indent=indent if indent > 0 else None,
+                          default=_json_default)
 
         return output_file
 
@@ -9,6 +9,7 @@ from qfxconvert.cli import parse_args, main
 
 
 TEST_DATA_DIR = Path(__file__).parent / "data"
+STMTRS_160 = TEST_DATA_DIR / "stmtrs-160.ofx"
 
 
 class TestParseArgs:
@@ -63,11 +64,41 @@ class TestParseArgs:
         assert 'file2.ofx' in args.input_files
         assert 'file3.qfx' in args.input_files
     
+    def test_jobs_flag(self):
+        """Test -j/--jobs flag."""
+        assert parse_args(['test.ofx']).jobs == 1
+        assert parse_args(['-j', '4', 'test.ofx']).jobs == 4
+        assert parse_args(['--jobs', '0', 'test.ofx']).jobs == 0
+        
+        with pytest.raises(SystemExit):
+            parse_args(['-j', '-1', 'test.ofx'])
+    
+    def test_pipeline_flag(self):
+        """Test --pipeline flag."""
+        assert parse_args(['test.ofx']).pipeline is False
+        assert parse_args(['--pipeline', 'test.ofx']).pipeline is True
+    
     def test_version_flag(self):
         """Test --version flag."""
         with pytest.raises(SystemExit) as exc_info:
             parse_args(['--version'])
         assert exc_info.value.code == 0
+    
+    def test_help_does_not_load_parser(self):
+        """Test that --help exits without importing ofxtools or process pools."""
+        import subprocess
+        code = (
+            "import atexit, sys\n"
+            "atexit.register(lambda: print(sorted(m for m in sys.modules"
+            " if m.startswith(('ofxtools', 'multiprocessing', 'concurrent')))))\n"
+            "from qfxconvert.cli import main\n"
+            "sys.argv = ['qfx-convert', '--help']\n"
+            "main()\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        assert result.returncode == 0
+        assert 'usage: qfx-convert' in result.stdout
+        assert result.stdout.rstrip().endswith('[]')
 
 
 class TestCLIMain:
@@ -76,9 +107,8 @@ class TestCLIMain:
     def test_successful_csv_conversion(self, tmp_path, monkeypatch):
         """Test successful CSV conversion."""
         import shutil
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "test.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         # Mock sys.argv
         monkeypatch.setattr(sys, 'argv', ['qfx-convert', str(input_file)])
@@ -92,9 +122,8 @@ class TestCLIMain:
     def test_successful_json_conversion(self, tmp_path, monkeypatch):
         """Test successful JSON conversion."""
         import shutil
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "test.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         monkeypatch.setattr(sys, 'argv', ['qfx-convert', '--json', str(input_file)])
         
@@ -113,6 +142,30 @@ class TestCLIMain:
         captured = capsys.readouterr()
         assert 'not found' in captured.err.lower()
     
+    @pytest.mark.parametrize("flags", [[], ['--pipeline']])
+    def test_missing_file_reported_in_order(self, tmp_path, monkeypatch, capsys, flags):
+        """Test that missing files are reported in input order."""
+        import shutil
+        for name in ("first.ofx", "second.ofx"):
+            shutil.copy(STMTRS_160, tmp_path / name)
+
+        monkeypatch.setattr(sys, 'argv', [
+            'qfx-convert',
+            *flags,
+            str(tmp_path / "first.ofx"),
+            str(tmp_path / "missing.ofx"),
+            str(tmp_path / "second.ofx")
+        ])
+        monkeypatch.setattr(sys, 'stderr', sys.stdout)
+
+        exit_code = main()
+
+        assert exit_code == 1
+        output = capsys.readouterr().out
+        assert (output.index("Processing " + str(tmp_path / "first.ofx"))
+                < output.index("File not found")
+                < output.index("Processing " + str(tmp_path / "second.ofx")))
+
     def test_multiple_files_with_single_output_error(self, monkeypatch, capsys):
         """Test error when specifying single output with multiple inputs."""
         monkeypatch.setattr(sys, 'argv', [
@@ -131,9 +184,8 @@ class TestCLIMain:
     def test_quiet_mode_suppresses_output(self, tmp_path, monkeypatch, capsys):
         """Test that quiet mode suppresses informational output."""
         import shutil
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "test.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         monkeypatch.setattr(sys, 'argv', ['qfx-convert', '-q', str(input_file)])
         
@@ -146,10 +198,9 @@ class TestCLIMain:
     def test_custom_output_file(self, tmp_path, monkeypatch):
         """Test conversion with custom output file."""
         import shutil
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "test.ofx"
         output_file = tmp_path / "custom_output.csv"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         monkeypatch.setattr(sys, 'argv', [
             'qfx-convert',
@@ -162,12 +213,71 @@ class TestCLIMain:
         assert exit_code == 0
         assert output_file.exists()
     
+    def test_parallel_conversion(self, tmp_path, monkeypatch, capsys):
+        """Test converting multiple files in parallel."""
+        import shutil
+        input_files = [tmp_path / "first.ofx", tmp_path / "second.ofx"]
+        for input_file in input_files:
+            shutil.copy(STMTRS_160, input_file)
+        
+        monkeypatch.setattr(sys, 'argv', [
+            'qfx-convert',
+            '-j', '2',
+            *[str(f) for f in input_files]
+        ])
+        
+        exit_code = main()
+        
+        assert exit_code == 0
+        assert (tmp_path / "first.csv").exists()
+        assert (tmp_path / "second.csv").exists()
+        captured = capsys.readouterr()
+        assert 'Processed 2 file(s) successfully, 0 error(s)' in captured.out
+    
+    def test_pipelined_conversion(self, tmp_path, monkeypatch):
+        """Test converting multiple files with read-ahead pipelining."""
+        import shutil
+        input_files = [tmp_path / "first.ofx", tmp_path / "second.ofx"]
+        for input_file in input_files:
+            shutil.copy(STMTRS_160, input_file)
+        
+        monkeypatch.setattr(sys, 'argv', [
+            'qfx-convert',
+            '--json',
+            '--pipeline',
+            *[str(f) for f in input_files]
+        ])
+        
+        exit_code = main()
+        
+        assert exit_code == 0
+        assert (tmp_path / "first.json").exists()
+        assert (tmp_path / "second.json").exists()
+
+    def test_pipelined_read_failure(self, tmp_path, monkeypatch, capsys):
+        """Test that a failed background read is reported instead of hanging."""
+        import shutil
+        input_file = tmp_path / "test.ofx"
+        shutil.copy(STMTRS_160, input_file)
+
+        def fail(self):
+            raise MemoryError("out of memory")
+
+        monkeypatch.setattr(Path, 'read_bytes', fail)
+        monkeypatch.setattr(sys, 'argv', ['qfx-convert', '--pipeline', str(input_file)])
+
+        exit_code = main()
+
+        assert exit_code == 1
+        captured = capsys.readouterr()
+        assert 'Error processing' in captured.err
+        assert 'Failed to parse OFX file: out of memory' in captured.err
+
     def test_compact_json_output(self, tmp_path, monkeypatch):
         """Test compact JSON output."""
         import shutil
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "test.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         monkeypatch.setattr(sys, 'argv', [
             'qfx-convert',
@@ -197,9 +307,8 @@ class TestCLIIntegration:
         import shutil
         import csv
         
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "statement.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         # Simulate CLI call
         import sys
@@ -226,9 +335,8 @@ class TestCLIIntegration:
         import shutil
         import json
         
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         input_file = tmp_path / "statement.ofx"
-        shutil.copy(test_file, input_file)
+        shutil.copy(STMTRS_160, input_file)
         
         import sys
         old_argv = sys.argv
@@ -241,9 +349,8 @@ class TestCLIIntegration:
             assert output_file.exists()
             
             # Verify JSON content
-            with open(output_file, 'r') as f:
-                data = json.load(f)
-                assert 'transactions' in data
-                assert len(data['transactions']) > 0
+            data = json.loads(output_file.read_bytes())
+            assert 'transactions' in data
+            assert len(data['transactions']) > 0
         finally:
             sys.argv = old_argv
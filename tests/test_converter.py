@@ -1,8 +1,13 @@
 """Unit tests for QFX/OFX converter."""
 
 import pytest
+import copy
 import json
 import csv
+import mmap
+import os
+import shutil
+import sys
 from pathlib import Path
 from decimal import Decimal
 
@@ -11,6 +16,54 @@ from qfxconvert.converter import QFXConverter, convert_qfx
 
 # Test data directory
 TEST_DATA_DIR = Path(__file__).parent / "data"
+STMTRS_160 = TEST_DATA_DIR / "stmtrs-160.ofx"
+NOTRANS = TEST_DATA_DIR / "notrans.ofx"
+NOTOFX = TEST_DATA_DIR / "notofx.gif"
+
+
+def _link_or_copy(source, destination):
+    """Hard-link source to destination, copying where links aren't supported."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy(source, destination)
+
+
+def _file_contains(path, needle):
+    """Check for bytes in a file without reading or decoding it."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return m.find(needle) != -1
+
+
+@pytest.fixture(scope="session")
+def parsed_converter():
+    """Converter for stmtrs-160.ofx, parsed once for the whole session."""
+    converter = QFXConverter(STMTRS_160)
+    converter.parse()
+    return converter
+
+
+@pytest.fixture(scope="session")
+def extracted_transactions(parsed_converter):
+    """Transactions extracted from the shared parsed converter."""
+    return parsed_converter._extract_transactions()
+
+
+@pytest.fixture
+def csv_reader(tmp_path, parsed_converter):
+    """Reader streaming the CSV written for the shared converter."""
+    output_file = tmp_path / "output.csv"
+    copy.copy(parsed_converter).to_csv(output_file)
+    with open(output_file, 'r', encoding='utf-8') as f:
+        yield csv.DictReader(f)
+
+
+@pytest.fixture
+def json_data(tmp_path, parsed_converter):
+    """Decoded JSON written for the shared converter."""
+    output_file = tmp_path / "output.json"
+    copy.copy(parsed_converter).to_json(output_file)
+    return json.loads(output_file.read_bytes())
 
 
 class TestQFXConverter:
@@ -18,9 +71,8 @@ class TestQFXConverter:
     
     def test_init_with_valid_file(self):
         """Test initialization with valid file."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        converter = QFXConverter(test_file)
-        assert converter.input_file == test_file
+        converter = QFXConverter(STMTRS_160)
+        assert converter.input_file == STMTRS_160
         assert not converter._parsed
     
     def test_init_with_nonexistent_file(self):
@@ -28,82 +80,127 @@ class TestQFXConverter:
         with pytest.raises(FileNotFoundError):
             QFXConverter("nonexistent_file.ofx")
     
+    def test_init_with_content(self, tmp_path):
+        """Test parsing contents that were read ahead of time."""
+        content = STMTRS_160.read_bytes()
+        converter = QFXConverter(tmp_path / "statement.ofx", content)
+        
+        result_path = converter.to_csv()
+        
+        assert result_path == tmp_path / "statement.csv"
+        assert result_path.exists()
+    
     def test_parse_valid_ofx(self):
         """Test parsing a valid OFX file."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        converter = QFXConverter(test_file)
+        converter = QFXConverter(STMTRS_160)
         converter.parse()
         assert converter._parsed
         assert converter.ofx_data is not None
     
+    @pytest.mark.skipif(not NOTOFX.exists(), reason="Test file notofx.gif not found")
     def test_parse_invalid_ofx(self):
         """Test parsing an invalid OFX file raises ValueError."""
-        test_file = TEST_DATA_DIR / "notofx.gif"
-        if not test_file.exists():
-            pytest.skip("Test file notofx.gif not found")
-        converter = QFXConverter(test_file)
+        converter = QFXConverter(NOTOFX)
         with pytest.raises(ValueError, match="Failed to parse OFX file"):
             converter.parse()
     
-    def test_extract_transactions(self):
-        """Test extracting transactions from OFX data."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
+    def test_parse_normalizes_non_ascii(self, tmp_path):
+        """Test that accented characters are normalized to ASCII."""
+        content = STMTRS_160.read_bytes()
+        test_file = tmp_path / "accented.ofx"
+        test_file.write_bytes(content.replace(b"<MEMO>Withdrawal", "<MEMO>Café".encode('utf-8')))
+
         converter = QFXConverter(test_file)
         transactions = converter._extract_transactions()
-        
-        assert len(transactions) > 0
+
+        assert transactions[0]['memo'] == 'Cafe'
+
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Named pipes not supported")
+    def test_parse_from_pipe(self, tmp_path):
+        """Test parsing input that can't be memory-mapped, such as a FIFO."""
+        import threading
+
+        fifo = tmp_path / "statement.ofx"
+        os.mkfifo(fifo)
+
+        def feed():
+            with open(fifo, 'wb') as f:
+                f.write(STMTRS_160.read_bytes())
+
+        writer = threading.Thread(target=feed)
+        writer.start()
+        try:
+            transactions = QFXConverter(fifo)._extract_transactions()
+        finally:
+            writer.join()
+
+        assert len(transactions) == 3
+
+    def test_extract_transactions(self, extracted_transactions):
+        """Test extracting transactions from OFX data."""
+        assert len(extracted_transactions) > 0
         # Check that first transaction has expected fields
-        trx = transactions[0]
+        trx = extracted_transactions[0]
         assert 'trnamt' in trx  # Transaction amount
         assert 'dtposted' in trx  # Date posted
         assert 'trntype' in trx  # Transaction type
         assert 'account_id' in trx  # Account ID
     
-    def test_transaction_decimal_precision(self):
-        """Test that transaction amounts preserve decimal precision."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        converter = QFXConverter(test_file)
+    def test_extraction_is_reused(self, tmp_path):
+        """Test that CSV and JSON output share a single extraction."""
+        converter = QFXConverter(STMTRS_160)
+
+        converter.to_csv(tmp_path / "output.csv")
         transactions = converter._extract_transactions()
+        converter.to_json(tmp_path / "output.json")
+
+        assert converter._extract_transactions() is transactions
+        assert converter._extract_positions() == []
+
+    def test_class_metadata_not_extracted(self, parsed_converter):
+        """Test that ofxtools class-level metadata is left out of the attribute cache."""
+        trx = parsed_converter.ofx_data.statements[0].transactions[0]
+        attrs = parsed_converter._data_attributes(trx)
         
-        # Check that amounts are floats (converted from Decimal)
-        for trx in transactions:
+        assert 'trnamt' in attrs
+        assert 'spec' not in attrs
+        assert 'elements' not in attrs
+
+    def test_transaction_decimal_precision(self, extracted_transactions):
+        """Test that transaction amounts preserve decimal precision."""
+        # Check that amounts are kept as exact Decimals
+        for trx in extracted_transactions:
             if 'trnamt' in trx:
-                assert isinstance(trx['trnamt'], float)
+                assert isinstance(trx['trnamt'], Decimal)
                 # Verify it's a reasonable financial amount
                 assert abs(trx['trnamt']) < 1000000  # Sanity check
     
-    def test_transaction_datetime_formatting(self):
+    def test_transaction_datetime_formatting(self, extracted_transactions):
         """Test that datetimes are properly formatted as ISO strings."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        converter = QFXConverter(test_file)
-        transactions = converter._extract_transactions()
-        
-        for trx in transactions:
-            if 'dtposted' in trx:
-                # Should be ISO format string
-                assert isinstance(trx['dtposted'], str)
-                # Should contain date separator
-                assert '-' in trx['dtposted'] or 'T' in trx['dtposted']
+        # Should be ISO format strings containing a date separator
+        assert all(
+            isinstance(trx['dtposted'], str)
+            and ('-' in trx['dtposted'] or 'T' in trx['dtposted'])
+            for trx in extracted_transactions if 'dtposted' in trx
+        )
     
-    def test_to_csv_creates_file(self, tmp_path):
-        """Test CSV conversion creates output file."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.csv"
+    @pytest.mark.parametrize("fmt,needle", [("csv", b"trnamt"), ("json", b'"trnamt"')])
+    def test_to_format_creates_file(self, tmp_path, parsed_converter, fmt, needle):
+        """Test CSV and JSON conversion create output files."""
+        output_file = tmp_path / f"output.{fmt}"
         
-        converter = QFXConverter(test_file)
-        result_path = converter.to_csv(output_file)
+        converter = copy.copy(parsed_converter)
+        result_path = getattr(converter, f"to_{fmt}")(output_file)
         
         assert result_path == output_file
-        assert output_file.exists()
-        assert output_file.stat().st_size > 0
+        assert os.path.getsize(output_file) > 0
+        assert _file_contains(output_file, needle)
     
     def test_to_csv_default_filename(self, tmp_path):
         """Test CSV conversion with default output filename."""
-        # Copy test file to tmp directory so default output goes there
-        import shutil
-        test_file_orig = TEST_DATA_DIR / "stmtrs-160.ofx"
+        # Link test file into tmp directory so default output goes there
         test_file = tmp_path / "test.ofx"
-        shutil.copy(test_file_orig, test_file)
+        _link_or_copy(STMTRS_160, test_file)
         
         converter = QFXConverter(test_file)
         result_path = converter.to_csv()
@@ -112,43 +209,46 @@ class TestQFXConverter:
         assert result_path == expected_path
         assert expected_path.exists()
     
-    def test_to_csv_content(self, tmp_path):
+    def test_to_csv_content(self, csv_reader):
         """Test CSV output contains correct data."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
+        first = next(csv_reader, None)
+        assert first is not None
+        # Check first row has expected fields
+        assert 'trnamt' in first
+        assert 'dtposted' in first
+        assert 'trntype' in first
+    
+    def test_to_csv_exact_amounts(self, tmp_path):
+        """Test CSV output writes amounts exactly as they appear in the OFX."""
         output_file = tmp_path / "output.csv"
         
-        converter = QFXConverter(test_file)
+        converter = QFXConverter(STMTRS_160)
         converter.to_csv(output_file)
         
-        # Read and verify CSV content
         with open(output_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            
-            assert len(rows) > 0
-            # Check first row has expected fields
-            assert 'trnamt' in rows[0]
-            assert 'dtposted' in rows[0]
-            assert 'trntype' in rows[0]
-    
-    def test_to_json_creates_file(self, tmp_path):
-        """Test JSON conversion creates output file."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.json"
+            amounts = [row['trnamt'] for row in csv.DictReader(f)]
         
-        converter = QFXConverter(test_file)
-        result_path = converter.to_json(output_file)
-        
-        assert result_path == output_file
-        assert output_file.exists()
-        assert output_file.stat().st_size > 0
+        assert amounts == ['-23.17', '-100.00', '-436.67']
+
+    def test_to_csv_amounts_without_exponent(self, tmp_path):
+        """Test CSV output never writes amounts in scientific notation."""
+        test_file = tmp_path / "zero.ofx"
+        test_file.write_bytes(
+            STMTRS_160.read_bytes().replace(b"<TRNAMT>-23.17", b"<TRNAMT>0.00000000")
+        )
+        output_file = tmp_path / "output.csv"
+
+        QFXConverter(test_file).to_csv(output_file)
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            amounts = [row['trnamt'] for row in csv.DictReader(f)]
+
+        assert amounts == ['0.00000000', '-100.00', '-436.67']
     
     def test_to_json_default_filename(self, tmp_path):
         """Test JSON conversion with default output filename."""
-        import shutil
-        test_file_orig = TEST_DATA_DIR / "stmtrs-160.ofx"
         test_file = tmp_path / "test.ofx"
-        shutil.copy(test_file_orig, test_file)
+        _link_or_copy(STMTRS_160, test_file)
         
         converter = QFXConverter(test_file)
         result_path = converter.to_json()
@@ -157,51 +257,79 @@ class TestQFXConverter:
         assert result_path == expected_path
         assert expected_path.exists()
     
-    def test_to_json_content(self, tmp_path):
+    def test_to_json_content(self, json_data):
         """Test JSON output contains correct data structure."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.json"
-        
-        converter = QFXConverter(test_file)
-        converter.to_json(output_file)
+        assert 'transactions' in json_data
+        assert isinstance(json_data['transactions'], list)
+        assert len(json_data['transactions']) > 0
         
-        # Read and verify JSON content
-        with open(output_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            assert 'transactions' in data
-            assert isinstance(data['transactions'], list)
-            assert len(data['transactions']) > 0
-            
-            # Check first transaction
-            trx = data['transactions'][0]
-            assert 'trnamt' in trx
-            assert 'dtposted' in trx
-            assert 'trntype' in trx
+        # Check first transaction
+        trx = json_data['transactions'][0]
+        assert 'trnamt' in trx
+        assert 'dtposted' in trx
+        assert 'trntype' in trx
     
     def test_to_json_compact(self, tmp_path):
         """Test JSON compact output has no indentation."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
         output_file = tmp_path / "output.json"
         
-        converter = QFXConverter(test_file)
+        converter = QFXConverter(STMTRS_160)
         converter.to_json(output_file, indent=0)
         
-        # Read content and verify it's compact
+        # Compact JSON shouldn't have much whitespace; count newlines in the
+        # raw bytes rather than splitting decoded text into lines
+        newlines = output_file.read_bytes().count(b"\n")
+        # Should be mostly on one or few lines
+        assert newlines < 9  # Generous threshold
+
+    def test_to_json_compact_matches_pretty(self, tmp_path):
+        """Test streamed compact JSON holds the same data as pretty output."""
+        compact_file = tmp_path / "compact.json"
+        pretty_file = tmp_path / "pretty.json"
+
+        converter = QFXConverter(STMTRS_160)
+        converter.to_json(compact_file, indent=0)
+        converter.to_json(pretty_file, indent=2)
+
+        compact = json.loads(compact_file.read_bytes())
+        pretty = json.loads(pretty_file.read_bytes())
+
+        assert compact == pretty
+
+    def test_to_json_without_orjson(self, tmp_path, monkeypatch):
+        """Test compact and pretty JSON output fall back to the json module."""
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+        compact_file = tmp_path / "compact.json"
+        pretty_file = tmp_path / "pretty.json"
+
+        converter = QFXConverter(STMTRS_160)
+        converter.to_json(compact_file, indent=0)
+        converter.to_json(pretty_file, indent=2)
+
+        compact = compact_file.read_text(encoding='utf-8')
+        pretty = pretty_file.read_text(encoding='utf-8')
+        assert '\n' not in compact
+        assert '\n  "transactions"' in pretty
+        assert json.loads(compact) == json.loads(pretty)
+        assert json.loads(compact)['transactions'][0]['trnamt'] == -23.17
+
+    def test_to_json_custom_indent(self, tmp_path):
+        """Test JSON output honours indents other than 2."""
+        output_file = tmp_path / "output.json"
+
+        converter = QFXConverter(STMTRS_160)
+        converter.to_json(output_file, indent=4)
+
         with open(output_file, 'r', encoding='utf-8') as f:
             content = f.read()
-            # Compact JSON shouldn't have much whitespace
-            lines = content.split('\n')
-            # Should be mostly on one or few lines
-            assert len(lines) < 10  # Generous threshold
-    
+            assert '\n    "transactions"' in content
+            data = json.loads(content)
+            assert len(data['transactions']) > 0
+
+    @pytest.mark.skipif(not NOTRANS.exists(), reason="Test file notrans.ofx not found")
     def test_ofx_without_transactions(self):
         """Test handling OFX file without transactions."""
-        test_file = TEST_DATA_DIR / "notrans.ofx"
-        if not test_file.exists():
-            pytest.skip("Test file notrans.ofx not found")
-        
-        converter = QFXConverter(test_file)
+        converter = QFXConverter(NOTRANS)
         with pytest.raises(ValueError, match="No transactions found"):
             converter.to_csv()
 
@@ -209,32 +337,20 @@ class TestQFXConverter:
 class TestConvertQFXFunction:
     """Test cases for the convert_qfx convenience function."""
     
-    def test_convert_to_csv(self, tmp_path):
-        """Test convert_qfx with CSV format."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.csv"
-        
-        result = convert_qfx(test_file, 'csv', output_file)
-        
-        assert result == output_file
-        assert output_file.exists()
-    
-    def test_convert_to_json(self, tmp_path):
-        """Test convert_qfx with JSON format."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.json"
+    @pytest.mark.parametrize("fmt,ext", [("csv", "csv"), ("json", "json")])
+    def test_convert_format(self, tmp_path, fmt, ext):
+        """Test convert_qfx with CSV and JSON formats."""
+        output_file = tmp_path / f"output.{ext}"
         
-        result = convert_qfx(test_file, 'json', output_file)
+        result = convert_qfx(STMTRS_160, fmt, output_file)
         
         assert result == output_file
         assert output_file.exists()
     
     def test_convert_invalid_format(self):
         """Test convert_qfx with invalid format raises ValueError."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        
         with pytest.raises(ValueError, match="Unsupported output format"):
-            convert_qfx(test_file, 'xml')
+            convert_qfx(STMTRS_160, 'xml')
     
     def test_convert_nonexistent_file(self):
         """Test convert_qfx with non-existent file."""
@@ -245,64 +361,40 @@ class TestConvertQFXFunction:
 class TestAccuracy:
     """Test cases for conversion accuracy."""
     
-    def test_amount_accuracy(self, tmp_path):
+    def test_amount_accuracy(self, csv_reader):
         """Test that transaction amounts are accurately converted."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.csv"
-        
-        converter = QFXConverter(test_file)
-        converter.to_csv(output_file)
-        
-        # Read CSV and verify amounts
-        with open(output_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            
-            # Check that we have expected test amounts
-            # From stmtrs-160.ofx: -23.17, -100.00, -436.67
-            amounts = [float(row['trnamt']) for row in rows if row.get('trnamt')]
-            
-            assert len(amounts) > 0
+        # Check that we have expected test amounts
+        # From stmtrs-160.ofx: -23.17, -100.00, -436.67
+        checked = 0
+        for row in csv_reader:
+            if not row.get('trnamt'):
+                continue
+            amt = float(row['trnamt'])
             # Verify precision is maintained (2 decimal places for currency)
-            for amt in amounts:
-                # Check that amount has reasonable precision
-                rounded = round(amt, 2)
-                assert abs(amt - rounded) < 0.001  # Within 0.1 cent
+            rounded = round(amt, 2)
+            assert abs(amt - rounded) < 0.001  # Within 0.1 cent
+            checked += 1
+        
+        assert checked > 0
     
-    def test_date_accuracy(self, tmp_path):
+    def test_date_accuracy(self, json_data):
         """Test that dates are accurately converted."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.json"
-        
-        converter = QFXConverter(test_file)
-        converter.to_json(output_file)
-        
-        with open(output_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-            for trx in data['transactions']:
-                if 'dtposted' in trx:
-                    # Verify date format is ISO
-                    date_str = trx['dtposted']
-                    assert isinstance(date_str, str)
-                    # Should contain year
-                    assert '2024' in date_str or '2025' in date_str or '202' in date_str
+        # Verify dates are ISO strings containing the year
+        assert all(
+            isinstance(trx['dtposted'], str)
+            and ('2024' in trx['dtposted'] or '2025' in trx['dtposted']
+                 or '202' in trx['dtposted'])
+            for trx in json_data['transactions'] if 'dtposted' in trx
+        )
     
-    def test_all_fields_preserved(self, tmp_path):
+    def test_all_fields_preserved(self, parsed_converter, extracted_transactions):
         """Test that all transaction fields are preserved."""
-        test_file = TEST_DATA_DIR / "stmtrs-160.ofx"
-        output_file = tmp_path / "output.json"
-        
-        converter = QFXConverter(test_file)
-        converter.parse()
-        
         # Get raw transaction
-        statements = converter.ofx_data.statements
+        statements = parsed_converter.ofx_data.statements
         raw_trx = statements[0].transactions[0]
         
         # Get converted transaction
-        transactions = converter._extract_transactions()
-        converted_trx = transactions[0]
+        converted_trx = extracted_transactions[0]
         
         # Check that key fields exist in converted data
         key_fields = ['trntype', 'dtposted', 'trnamt', 'fitid']